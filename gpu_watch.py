@@ -1,28 +1,32 @@
 #!/usr/bin/env python3
 """
-gpu_watch.py — Sample per-process GPU usage periodically and save to CSV.
+gpu_watch.py — Sample per-process GPU usage periodically and save to CSV, Parquet or packed binary records.
 
 Features:
 - Target by --pid or by command substring/regex via --match
-- Collects per-process GPU memory (MiB) and estimated SM/mem utilization (%) via `nvidia-smi pmon`
-- Works without extra Python deps (uses subprocess)
-- Appends to CSV every --interval seconds until Ctrl+C
+- Collects per-process GPU memory (MiB) and estimated SM/mem utilization (%)
+- Queries NVML in-process via `pynvml` (nvidia-ml-py) when installed; otherwise
+  falls back to `nvidia-smi` subprocess calls, so no extra Python deps are required
+- Appends a row per process every --interval seconds until Ctrl+C or SIGTERM/SIGHUP
+  (--format parquet needs pyarrow; --format bin writes packed fixed-size records)
 - CSV columns: timestamp,gpu_index,pid,cmd,gpu_mem_mib,sm_util_pct,mem_util_pct
+  (timestamp is integer epoch seconds; ISO 8601 with --iso-timestamps)
 
 Examples:
   python3 gpu_watch.py --match python --interval 30 --output ~/gpu_log.csv
   python3 gpu_watch.py --pid 1622588 --interval 10 --output ./log.csv
 """
 import argparse
-import csv
 import os
 import re
 import shlex
+import signal
+import struct
 import subprocess
 import sys
 import time
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, NamedTuple, Tuple, Optional
 
 def run_cmd(cmd: List[str], timeout: float = 5.0) -> str:
     try:
@@ -31,20 +35,101 @@ def run_cmd(cmd: List[str], timeout: float = 5.0) -> str:
     except Exception:
         return ""
 
-def get_uuid_to_index() -> Dict[str, str]:
-    # Map GPU UUID -> index
+try:
+    import pynvml  # optional: pip install nvidia-ml-py
+except ImportError:
+    pynvml = None
+
+# NVML state, populated once by init_nvml(). When _nvml_ok is False every
+# sampler below falls back to parsing nvidia-smi output.
+_nvml_ok = False
+_nvml_handles: List = []
+_nvml_compute_procs = None
+# Per GPU index: timestamp (us) of the newest utilization sample already consumed
+_last_seen_ts: Dict[int, int] = {}
+# Errors after which device handles are re-enumerated (e.g. hot-plug)
+_NVML_REFRESH_ERRORS = (pynvml.NVMLError_Unknown,) if pynvml is not None else ()
+
+# (gpu index, error) pairs already reported, so a failing device warns only once
+_nvml_warned = set()
+
+# nvidia-smi fallback only: GPU UUID -> index, immutable barring hot-plug
+_uuid_to_index: Dict[str, int] = {}
+
+def init_nvml() -> bool:
+    """
+    Initialize NVML and cache device handles. Returns False if pynvml is missing
+    or nvmlInit fails, in which case the nvidia-smi fallback is used.
+    """
+    global _nvml_ok, _nvml_compute_procs
+    if pynvml is None:
+        return False
+    try:
+        pynvml.nvmlInit()
+        _nvml_enumerate()
+    except pynvml.NVMLError:
+        return False
+    # _v3 is only exposed by newer bindings, and only resolvable with newer drivers
+    _nvml_compute_procs = getattr(pynvml, "nvmlDeviceGetComputeRunningProcesses_v3",
+                                  pynvml.nvmlDeviceGetComputeRunningProcesses)
+    if _nvml_handles and _nvml_compute_procs is not pynvml.nvmlDeviceGetComputeRunningProcesses:
+        try:
+            _nvml_compute_procs(_nvml_handles[0])
+        except pynvml.NVMLError_FunctionNotFound:
+            _nvml_compute_procs = pynvml.nvmlDeviceGetComputeRunningProcesses
+        except pynvml.NVMLError:
+            pass  # device-specific; reported by sample_all()
+    _nvml_ok = True
+    return True
+
+def _nvml_enumerate() -> None:
+    global _nvml_handles
+    _nvml_handles = [pynvml.nvmlDeviceGetHandleByIndex(i)
+                     for i in range(pynvml.nvmlDeviceGetCount())]
+    _last_seen_ts.clear()
+
+def shutdown_nvml() -> None:
+    if _nvml_ok:
+        try:
+            pynvml.nvmlShutdown()
+        except pynvml.NVMLError:
+            pass
+
+def get_uuid_to_index() -> Dict[str, int]:
+    # Map GPU UUID -> index (NVML needs no map: handles are enumerated by index)
     out = run_cmd(["nvidia-smi", "--query-gpu=index,uuid", "--format=csv,noheader"])
     mapping = {}
     for line in out.strip().splitlines():
         parts = [p.strip() for p in line.split(",")]
-        if len(parts) == 2:
+        if len(parts) == 2 and parts[0].isdigit():
             idx, uuid = parts
-            mapping[uuid] = idx
+            mapping[uuid] = int(idx)
     return mapping
 
-def get_process_memory_rows() -> List[Tuple[str, str, str]]:
+def refresh_devices() -> None:
+    """Re-enumerate NVML devices, or rebuild the nvidia-smi UUID -> index map in place."""
+    if _nvml_ok:
+        try:
+            _nvml_enumerate()
+        except pynvml.NVMLError:
+            # Devices still settling; retried on the next refresh error
+            pass
+        return
+    _uuid_to_index.clear()
+    _uuid_to_index.update(get_uuid_to_index())
+
+class ProcSample(NamedTuple):
+    """One compute process on one GPU, memory and utilization taken in the same pass."""
+    pid: int
+    gpu_index: Optional[int]  # None only if the nvidia-smi fallback cannot resolve the UUID
+    used_mib: int
+    sm: Optional[int]
+    mem: Optional[int]
+    cmd: str  # command name from pmon; empty on the NVML path (see _nvml_process_name)
+
+def get_process_memory_rows() -> List[Tuple[int, Optional[int], int]]:
     """
-    Returns list of (pid, gpu_uuid, used_mib) for compute apps.
+    nvidia-smi fallback: returns list of (pid, gpu_index, used_mib) for compute apps.
     """
     # Some nvidia-smi versions support process_name in query, but we only need pid+uuid+mem
     out = run_cmd(["nvidia-smi",
@@ -56,14 +141,81 @@ def get_process_memory_rows() -> List[Tuple[str, str, str]]:
         parts = [p.strip() for p in line.split(",")]
         if len(parts) >= 3:
             pid, uuid, used = parts[:3]
+            if not pid.isdigit():
+                continue
             # Clean used (strip non-digits if any linger)
             used_num = "".join(ch for ch in used if ch.isdigit())
-            rows.append((pid, uuid, used_num or "0"))
+            rows.append((int(pid), _uuid_to_index.get(uuid), int(used_num or 0)))
     return rows
 
-def get_pmon_snapshot() -> List[Dict[str, str]]:
+def _nvml_utilization(gpu: int, handle) -> Dict:
+    # pid -> newest utilization sample on this GPU since the previous call
+    try:
+        samples = pynvml.nvmlDeviceGetProcessUtilization(handle, _last_seen_ts.get(gpu, 0))
+    except pynvml.NVMLError:
+        # NVML_ERROR_NOT_FOUND: no new samples since the last call
+        return {}
+    # The driver may buffer several samples per pid; keep the newest
+    latest = {}
+    for smp in samples:
+        prev = latest.get(smp.pid)
+        if prev is None or smp.timeStamp > prev.timeStamp:
+            latest[smp.pid] = smp
+        if smp.timeStamp > _last_seen_ts.get(gpu, 0):
+            _last_seen_ts[gpu] = smp.timeStamp
+    return latest
+
+def _nvml_process_name(pid: int) -> str:
+    # Fallback name when /proc/<pid> is not visible (e.g. host PIDs seen from a
+    # container); asked only for rows that need it, never in sample_all()
+    if not _nvml_ok:
+        return ""
+    try:
+        name = pynvml.nvmlSystemGetProcessName(pid)
+    except pynvml.NVMLError:
+        return ""
+    # Older pynvml releases return bytes, newer ones str
+    return name.decode(errors="replace") if isinstance(name, bytes) else name
+
+def sample_all() -> List[ProcSample]:
+    """
+    Sample every compute process: one NVML walk over the device handles, or
+    nvidia-smi --query-compute-apps joined by pid with a pmon snapshot.
+    """
+    result = []
+    if _nvml_ok:
+        for idx, h in enumerate(_nvml_handles):
+            try:
+                procs = _nvml_compute_procs(h)
+            except _NVML_REFRESH_ERRORS:
+                raise
+            except pynvml.NVMLError as e:
+                # GpuIsLost, NoPermission, ...: skip this device, keep sampling the rest
+                if (idx, str(e)) not in _nvml_warned:
+                    _nvml_warned.add((idx, str(e)))
+                    print(f"WARNING: GPU {idx}: cannot query compute processes: {e}", file=sys.stderr)
+                continue
+            util = _nvml_utilization(idx, h) if procs else {}
+            for p in procs:
+                u = util.get(p.pid)
+                # usedGpuMemory is None when the driver cannot report it
+                result.append(ProcSample(p.pid, idx, (p.usedGpuMemory or 0) >> 20,
+                                         u.smUtil if u else None, u.memUtil if u else None, ""))
+        return result
+    pmon_by_pid = {r["pid"]: r for r in get_pmon_snapshot()}
+    for pid, gpu_index, used in get_process_memory_rows():
+        r = pmon_by_pid.get(pid)
+        if r is None:
+            result.append(ProcSample(pid, gpu_index, used, None, None, ""))
+            continue
+        if gpu_index is None:
+            gpu_index = r["gpu"]
+        result.append(ProcSample(pid, gpu_index, used, r["sm"], r["mem"], r["cmd"]))
+    return result
+
+def get_pmon_snapshot() -> List[Dict]:
     """
-    Returns a list of dict with keys: gpu, pid, sm, mem, cmd
+    nvidia-smi fallback: returns a list of dict with keys: gpu, pid, sm, mem, cmd
     Using: nvidia-smi pmon -c 1 -s um  (one-shot sample)
     """
     out = run_cmd(["nvidia-smi", "pmon", "-c", "1", "-s", "um"], timeout=7.0)
@@ -91,107 +243,301 @@ def get_pmon_snapshot() -> List[Dict[str, str]]:
             except Exception:
                 return None
         result.append({
-            "gpu": gpu,
-            "pid": pid,
+            "gpu": parse_pct(gpu),
+            "pid": int(pid),
             "sm": parse_pct(sm),
             "mem": parse_pct(mem),
             "cmd": cmd
         })
     return result
 
-def get_cmd_for_pid(pid: int) -> str:
-    # Use ps to get full command line (args)
+# pid -> full command line; PIDs keep their cmdline for their lifetime
+_cmd_cache: Dict[int, str] = {}
+# pid -> --match result for that command line; same lifetime as _cmd_cache
+_match_cache: Dict[int, bool] = {}
+# ps reads the same procfs, so with /proc mounted it can't resolve what /proc didn't
+# (e.g. host PIDs reported by NVML inside a container)
+_have_procfs = os.path.isdir("/proc/self")
+
+def _match_string(pid: int) -> str:
+    # Command line for filtering: a single cached /proc read, never a subprocess
     try:
-        out = run_cmd(["ps", "-o", "args=", "-p", str(pid)]).strip()
-        return out or ""
-    except Exception:
+        return _cmd_cache[pid]
+    except KeyError:
+        pass
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as fh:
+            cmd = fh.read().replace(b"\0", b" ").decode(errors="replace").strip()
+    except OSError:
         return ""
+    if cmd:
+        _cmd_cache[pid] = cmd
+    return cmd
+
+def get_cmd_for_pid(pid: int) -> str:
+    # Full command line for the cmd column; only called for rows that are written
+    cmd = _match_string(pid)
+    if cmd or _have_procfs:
+        return cmd
+    # No procfs: use ps to get full command line (args)
+    cmd = run_cmd(["ps", "-o", "args=", "-p", str(pid)]).strip()
+    if cmd:
+        _cmd_cache[pid] = cmd
+    return cmd
+
+def prune_pid_caches() -> None:
+    # Drop cached command lines / match results of exited processes (single /proc scan)
+    if not _cmd_cache and not _match_cache:
+        return
+    try:
+        alive = {int(d) for d in os.listdir("/proc") if d.isdigit()}
+    except OSError:
+        _cmd_cache.clear()
+        _match_cache.clear()
+        return
+    for cache in (_cmd_cache, _match_cache):
+        for pid in cache.keys() - alive:
+            del cache[pid]
+
+def compile_matcher(pattern: str) -> re.Pattern:
+    try:
+        return re.compile(pattern, re.ASCII)
+    except re.error:
+        # treat as literal substring
+        return re.compile(re.escape(pattern), re.ASCII)
 
-def match_pid(pid: int, matcher: Optional[re.Pattern], pid_target: Optional[int]) -> bool:
+def make_match_fn(matcher: Optional[re.Pattern], pid_target: Optional[int]) -> Callable[[ProcSample], bool]:
+    # Decide the filter once at startup so the per-sample loop has no branching
     if pid_target is not None:
-        return pid == pid_target
+        return lambda smp: smp.pid == pid_target
     if matcher is None:
-        return True
-    cmd = get_cmd_for_pid(pid)
-    return bool(matcher.search(cmd))
+        return lambda smp: True
+
+    def matches(smp: ProcSample) -> bool:
+        try:
+            return _match_cache[smp.pid]
+        except KeyError:
+            pass
+        cmd = _match_string(smp.pid)
+        if not cmd:
+            # No /proc entry: match the pmon / NVML name and don't remember the verdict
+            return bool(matcher.search(smp.cmd or _nvml_process_name(smp.pid)))
+        hit = _match_cache[smp.pid] = bool(matcher.search(cmd))
+        return hit
+    return matches
+
+CSV_HEADER = "timestamp,gpu_index,pid,cmd,gpu_mem_mib,sm_util_pct,mem_util_pct\r\n"
+
+def csv_quote(value: str) -> str:
+    # Same result as csv.QUOTE_MINIMAL for the free-text cmd column
+    if any(ch in value for ch in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+class CsvLog:
+    """CSV sink: rows are formatted by hand and buffered, flushed every flush_every rows."""
+
+    def __init__(self, path: str, write_header: bool, flush_every: int, iso_timestamps: bool):
+        self.f = open(path, "ab", buffering=1 << 16)
+        self.flush_every = flush_every
+        self.iso_timestamps = iso_timestamps
+        self.pending = 0
+        self.ts = ""
+        if write_header:
+            self.f.write(CSV_HEADER.encode())
+            self.f.flush()
+
+    def begin(self, now: float) -> None:
+        if self.iso_timestamps:
+            self.ts = datetime.fromtimestamp(now).isoformat(timespec="seconds")
+        else:
+            self.ts = str(int(now))
+
+    def write(self, smp: ProcSample, cmd: str) -> None:
+        gpu_index = "" if smp.gpu_index is None else smp.gpu_index
+        sm_util = "" if smp.sm is None else smp.sm
+        mem_util = "" if smp.mem is None else smp.mem
+        self.f.write(f"{self.ts},{gpu_index},{smp.pid},{csv_quote(cmd)},{smp.used_mib},"
+                     f"{sm_util},{mem_util}\r\n".encode())
+        self.pending += 1
+
+    def end(self) -> None:
+        if self.pending >= self.flush_every:
+            self.f.flush()
+            self.pending = 0
+
+    def close(self) -> None:
+        self.f.close()
+
+# --format bin: fixed 16-byte little-endian records, appended with no header:
+# timestamp (epoch s), pid, gpu_mem_mib (u32), gpu_index (u16), sm, mem (u8).
+# Missing values are all-ones (0xFFFF / 0xFF). plot_gpu_usage.py mmaps these.
+BIN_RECORD = struct.Struct("<IIIHBB")
+
+class BinLog:
+    """Packed binary sink; buffered like CsvLog, flushed every flush_every records."""
+
+    def __init__(self, path: str, flush_every: int):
+        self.f = open(path, "ab", buffering=1 << 16)
+        # A partial trailing record (interrupted write, ENOSPC) would shift every record
+        # appended after it; drop it so the file stays a whole number of records
+        size = os.fstat(self.f.fileno()).st_size
+        if size % BIN_RECORD.size:
+            print(f"WARNING: {path}: dropping {size % BIN_RECORD.size} bytes of a partial record",
+                  file=sys.stderr)
+            self.f.truncate(size - size % BIN_RECORD.size)
+        self.flush_every = flush_every
+        self.pending = 0
+        self.ts = 0
+
+    def begin(self, now: float) -> None:
+        self.ts = int(now)
+
+    def write(self, smp: ProcSample, cmd: str) -> None:
+        # cmd is not stored: records must stay fixed-width
+        self.f.write(BIN_RECORD.pack(
+            self.ts, smp.pid, min(smp.used_mib, 0xFFFFFFFF),
+            0xFFFF if smp.gpu_index is None else smp.gpu_index,
+            0xFF if smp.sm is None else smp.sm,
+            0xFF if smp.mem is None else smp.mem))
+        self.pending += 1
+
+    def end(self) -> None:
+        if self.pending >= self.flush_every:
+            self.f.flush()
+            self.pending = 0
+
+    def close(self) -> None:
+        self.f.close()
+
+class ParquetLog:
+    """
+    Parquet sink (pyarrow): typed columns, one row group per batch_rows rows.
+    The file footer is written on close, so the file is readable once gpu_watch exits.
+    """
+
+    def __init__(self, path: str, batch_rows: int = 256):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except Exception as e:
+            print("pyarrow not available: {}".format(e), file=sys.stderr)
+            sys.exit(2)
+        self.pa = pa
+        self.schema = pa.schema([
+            ("timestamp", pa.timestamp("s")),
+            ("gpu_index", pa.int8()),
+            ("pid", pa.uint32()),
+            ("cmd", pa.string()),
+            ("gpu_mem_mib", pa.uint32()),
+            ("sm_util_pct", pa.uint8()),
+            ("mem_util_pct", pa.uint8()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.batch_rows = batch_rows
+        self.columns: List[list] = [[] for _ in self.schema]
+        self.ts = 0
+
+    def begin(self, now: float) -> None:
+        self.ts = int(now)
+
+    def write(self, smp: ProcSample, cmd: str) -> None:
+        for col, value in zip(self.columns, (self.ts, smp.gpu_index, smp.pid, cmd,
+                                             smp.used_mib, smp.sm, smp.mem)):
+            col.append(value)
+
+    def end(self) -> None:
+        if len(self.columns[0]) >= self.batch_rows:
+            self._write_batch()
+
+    def _write_batch(self) -> None:
+        arrays = [self.pa.array(col, type=field.type) for col, field in zip(self.columns, self.schema)]
+        self.writer.write_batch(self.pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        for col in self.columns:
+            col.clear()
+
+    def close(self) -> None:
+        if self.columns[0]:
+            self._write_batch()
+        self.writer.close()
 
 def main():
-    ap = argparse.ArgumentParser(description="Monitor per-process GPU usage and save to CSV.")
+    ap = argparse.ArgumentParser(description="Monitor per-process GPU usage and save to CSV, Parquet or packed binary records.")
     group = ap.add_mutually_exclusive_group(required=False)
     group.add_argument("--pid", type=int, help="Target a single PID")
     group.add_argument("--match", type=str, help="Regex/substring to match process command line")
     ap.add_argument("--interval", type=int, default=30, help="Sampling interval in seconds (default: 30)")
-    ap.add_argument("--output", type=str, default="gpu_log.csv", help="Output CSV path")
-    ap.add_argument("--append", action="store_true", help="Append without header if file exists (default: header added if new file)")
+    ap.add_argument("--output", type=str, default=None, help="Output path (default: gpu_log.<format>)")
+    ap.add_argument("--format", choices=("csv", "parquet", "bin"), default="csv",
+                    help="Output format (default: csv); parquet requires pyarrow; bin appends fixed-size records without cmd")
+    ap.add_argument("--append", action="store_true", help="Append without header if file exists (default: header added if new file; csv only)")
+    ap.add_argument("--iso-timestamps", action="store_true", help="Write ISO 8601 local-time timestamps instead of integer epoch seconds (csv only)")
+    ap.add_argument("--flush-every", type=int, default=1, help="Flush the CSV/bin output once at least this many rows are buffered (default: 1, i.e. every sample)")
     args = ap.parse_args()
+    if args.format == "parquet" and args.append:
+        ap.error("--append is not supported with --format parquet")
+    out_path = os.path.expanduser(args.output or f"gpu_log.{args.format}")
+    if args.format == "parquet" and os.path.exists(out_path):
+        # ParquetWriter truncates; a finished log can't be appended to
+        ap.error(f"{out_path} already exists; Parquet output is never overwritten")
 
-    matcher = None
-    if args.match:
-        try:
-            matcher = re.compile(args.match)
-        except re.error:
-            # treat as literal substring
-            matcher = re.compile(re.escape(args.match))
+    match_fn = make_match_fn(compile_matcher(args.match) if args.match else None, args.pid)
 
-    uuid_to_index = get_uuid_to_index()
+    if not init_nvml() and not run_cmd(["which", "nvidia-smi"]).strip():
+        print("ERROR: pynvml unavailable and nvidia-smi not found in PATH.", file=sys.stderr)
+        sys.exit(1)
 
-    out_path = os.path.expanduser(args.output)
-    file_exists = os.path.exists(out_path)
+    refresh_devices()
 
-    # Open CSV
-    f = open(out_path, "a", newline="")
-    writer = csv.writer(f)
+    if args.format == "parquet":
+        log = ParquetLog(out_path)
+    elif args.format == "bin":
+        log = BinLog(out_path, args.flush_every)
+    else:
+        file_exists = os.path.exists(out_path)
+        log = CsvLog(out_path, not file_exists or not args.append, args.flush_every, args.iso_timestamps)
 
-    if not file_exists or not args.append:
-        writer.writerow(["timestamp", "gpu_index", "pid", "cmd", "gpu_mem_mib", "sm_util_pct", "mem_util_pct"])
-        f.flush()
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+    # kill, systemd stop or a closed terminal leave through the same finally as Ctrl+C,
+    # so buffers are flushed and the Parquet footer is written
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGHUP, stop)
+
+    # Sample on a fixed monotonic schedule so processing time doesn't add drift
+    interval = max(1, args.interval)
+    next_tick = time.monotonic()
 
     try:
         while True:
-            ts = datetime.now().isoformat(timespec="seconds")
-            mem_rows = get_process_memory_rows()  # (pid, uuid, used_mib)
-            pmon_rows = get_pmon_snapshot()       # dicts with pid, gpu, sm, mem, cmd
-
-            # Build quick lookup from pid -> (sm, mem, gpu, cmd_from_pmon)
-            pmon_by_pid: Dict[int, Dict[str, Optional[str]]] = {}
-            for r in pmon_rows:
-                pid = int(r["pid"])
-                pmon_by_pid[pid] = {
-                    "gpu": r["gpu"],
-                    "sm": r["sm"],
-                    "mem": r["mem"],
-                    "cmd": r["cmd"],
-                }
-
-            # Iterate over memory rows (definitive list of CUDA compute procs)
-            for pid_str, uuid, used in mem_rows:
-                try:
-                    pid = int(pid_str)
-                except ValueError:
-                    continue
-                if not match_pid(pid, matcher, args.pid):
-                    continue
-
-                # Prefer command from ps (full), fallback to pmon
-                cmd = get_cmd_for_pid(pid) or pmon_by_pid.get(pid, {}).get("cmd") or ""
-
-                # GPU index from uuid if available, else from pmon
-                gpu_index = uuid_to_index.get(uuid, pmon_by_pid.get(pid, {}).get("gpu") or "")
-
-                sm_util = pmon_by_pid.get(pid, {}).get("sm")
-                mem_util = pmon_by_pid.get(pid, {}).get("mem")
+            log.begin(time.time())
+            prune_pid_caches()
+            try:
+                samples = sample_all()
+            except _NVML_REFRESH_ERRORS:
+                # Device set changed under us; rebuild handles and retry next interval
+                refresh_devices()
+                samples = []
 
-                writer.writerow([ts, gpu_index, pid, cmd, used, sm_util if sm_util is not None else "", mem_util if mem_util is not None else ""])
-            f.flush()
-            time.sleep(max(1, args.interval))
+            # One row per compute process per GPU
+            for smp in samples:
+                if not match_fn(smp):
+                    continue
+                # Prefer full command from /proc (or ps), fallback to pmon / NVML
+                log.write(smp, get_cmd_for_pid(smp.pid) or smp.cmd or _nvml_process_name(smp.pid))
+            log.end()
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                # Fell behind (slow sample, suspend): skip missed ticks rather than burst
+                next_tick = time.monotonic()
+                delay = 0
+            time.sleep(delay)
     except KeyboardInterrupt:
         pass
     finally:
-        f.close()
+        log.close()
+        shutdown_nvml()
 
 if __name__ == "__main__":
-    # Quick availability check
-    if not run_cmd(["which", "nvidia-smi"]).strip():
-        print("ERROR: nvidia-smi not found in PATH.", file=sys.stderr)
-        sys.exit(1)
     main()
@@ -1,56 +1,255 @@
 #!/usr/bin/env python3
 """
-Plot GPU, system memory, and optional CPU% usage over time from CSV logs.
+Plot GPU, system memory, and optional CPU% usage over time from CSV, Parquet or binary logs.
 
 Supports:
-- CSV from gpu_watch.py with header:
+- CSV from gpu_watch.py with header (epoch-second or ISO timestamps):
   timestamp,gpu_index,pid,cmd,gpu_mem_mib,sm_util_pct,mem_util_pct
 - Minimal CSV like gpu_watch.sh output with headers:
   timestamp,used_mib[,sys_used_mib][,cpu_cores][,cpu_pct]
+- Parquet from gpu_watch.py --format parquet (*.parquet; needs pandas + pyarrow)
+- Packed records from gpu_watch.py --format bin (*.bin; memory-mapped, no parsing)
+
+Uses pandas for vectorized loading when installed, otherwise the csv module.
 
 Usage examples:
   python3 plot_gpu_usage.py gpu_log.csv --output gpu_usage.png
   python3 plot_gpu_usage.py gpu_log.csv --per-gpu --output per_gpu.png
   python3 plot_gpu_usage.py mem_only.csv --cpu --output mem_mem_cpu.png
   python3 plot_gpu_usage.py gpu_log.csv --show
+  python3 plot_gpu_usage.py gpu_log.parquet --per-gpu --output per_gpu.png
 """
 import argparse
+import contextlib
 import csv
+import mmap
 import os
 import sys
 from collections import defaultdict
-from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Tuple, Optional, TextIO, Union
+
+try:
+    import numpy as np  # ships with matplotlib
+except Exception as e:
+    print("numpy not available: {}".format(e), file=sys.stderr)
+    sys.exit(2)
+
+try:
+    import pandas as pd  # optional: vectorized CSV loading
+except ImportError:
+    pd = None
+
+# One plotted line, stored column-wise: (datetime64[ns] times, float32 values)
+Series = Tuple[np.ndarray, np.ndarray]
+
+# Record layout of gpu_watch.py --format bin (struct "<IIIHBB", 16 bytes)
+BIN_RECORD = np.dtype([
+    ("timestamp", "<u4"),
+    ("pid", "<u4"),
+    ("gpu_mem_mib", "<u4"),
+    ("gpu_index", "<u2"),
+    ("sm_util_pct", "u1"),
+    ("mem_util_pct", "u1"),
+])
+BIN_NO_GPU = 0xFFFF
+
+
+def _slow_parse(ts: str) -> datetime:
+    # Fallbacks: try common formats without timezone
+    for fmt in (
+        "%Y-%m-%d %H:%M:%S",
+        "%Y/%m/%d %H:%M:%S",
+        "%Y-%m-%dT%H:%M:%S",
+    ):
+        try:
+            return datetime.strptime(ts, fmt)
+        except ValueError:
+            pass
+    return datetime.fromisoformat(ts)  # raises with the usual message
 
 
+@lru_cache(maxsize=1 << 15)
 def parse_time(ts: str) -> datetime:
-    # Prefer ISO8601 parsing; Python 3.7+ supports offsets
-    try:
+    # Integer epoch seconds (gpu_watch.py default) become local naive time, the same
+    # wall clock the --iso-timestamps writer records, so mixed logs sort and line up
+    if ts.isdigit():
+        return datetime.fromtimestamp(int(ts))
+    # ISO8601 (gpu_watch.py --iso-timestamps, `date -Is`) goes straight to fromisoformat;
+    # Python 3.7+ supports offsets. Cached: per-GPU logs repeat each timestamp.
+    if len(ts) > 10 and ts[4] == "-" and ts[10] in ("T", " "):
         return datetime.fromisoformat(ts)
-    except Exception:
-        # Fallbacks: try common formats without timezone
-        for fmt in (
-            "%Y-%m-%d %H:%M:%S",
-            "%Y/%m/%d %H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S",
-        ):
-            try:
-                return datetime.strptime(ts, fmt)
-            except Exception:
-                pass
-        raise
+    return _slow_parse(ts)
+
+
+def _opened(source: Union[str, TextIO]):
+    # Loaders take a path or an already-open text file (auto_loader passes its handle)
+    if isinstance(source, str):
+        return open(source, newline="")
+    return contextlib.nullcontext(source)
+
+
+def _naive(t: datetime) -> datetime:
+    # Aware datetimes become naive UTC, which is how matplotlib renders them anyway
+    return t.astimezone(timezone.utc).replace(tzinfo=None) if t.tzinfo else t
+
+
+def _from_pairs(pairs: List[Tuple[datetime, float]]) -> Series:
+    times = [_naive(t) for t, _ in pairs]
+    return (np.array(times, dtype="datetime64[ns]"),
+            np.fromiter((v for _, v in pairs), dtype=np.float32, count=len(pairs)))
+
+
+def _from_pandas(s: "pd.Series") -> Series:
+    # DatetimeIndex.values is naive datetime64 (UTC for tz-aware indices)
+    return s.index.values.astype("datetime64[ns]"), s.to_numpy(dtype=np.float32)
+
+
+def _utc_to_local(ts: "pd.Series") -> "pd.Series":
+    # Epoch-based times are shown as local naive time, matching parse_time()
+    from dateutil.tz import tzlocal  # a pandas dependency
+    if ts.dt.tz is None:
+        ts = ts.dt.tz_localize("UTC")
+    return ts.dt.tz_convert(tzlocal()).dt.tz_localize(None)
+
+
+def _parse_time_or_none(ts: str) -> Optional[datetime]:
+    try:
+        return _naive(parse_time(ts))
+    except ValueError:
+        return None
+
+
+def _parse_times_pandas(text: "pd.Series") -> "pd.Series":
+    # format="ISO8601" takes every ISO variant (T or space, fractions, offsets) rather than
+    # inferring one format from the first row and coercing the rest to NaT; naive like
+    # _naive(). Anything else (%Y/%m/%d, a repeated header) goes through parse_time.
+    ts = pd.to_datetime(text, format="ISO8601", utc=True, errors="coerce", cache=True).dt.tz_localize(None)
+    rest = ts.isna() & text.notna()
+    if rest.any():
+        ts[rest] = pd.to_datetime(text[rest].map(_parse_time_or_none))
+    return ts
+
+
+def _load_gpu_watch_pandas(source: Union[str, TextIO], per_gpu: bool):
+    df = pd.read_csv(source, usecols=["timestamp", "gpu_index", "gpu_mem_mib"], dtype={"gpu_index": "string"})
+    col = df["timestamp"]
+    # Per element: epoch seconds and ISO strings can share a log (--append after toggling
+    # --iso-timestamps). Coerce: a repeated header row becomes NaT and is dropped.
+    epoch = pd.to_numeric(col, errors="coerce")
+    ts = _utc_to_local(pd.to_datetime(epoch, unit="s", utc=True))
+    if epoch.isna().any():
+        ts = ts.fillna(_parse_times_pandas(col.astype("string").where(epoch.isna())))
+    df["timestamp"] = ts
+    return _gpu_watch_frame_to_series(df, per_gpu)
 
 
-def load_series_from_gpu_watch(path: str, per_gpu: bool) -> Tuple[
-    Dict[str, List[Tuple[datetime, float]]],  # gpu
-    Dict[str, List[Tuple[datetime, float]]],  # ram (none here)
-    Dict[str, List[Tuple[datetime, float]]],  # cpu (none here)
+def load_series_from_parquet(path: str, per_gpu: bool) -> Tuple[
+    Dict[str, Series],  # gpu
+    Dict[str, Series],  # ram (none here)
+    Dict[str, Series],  # cpu (none here)
+]:
+    """Same as load_series_from_gpu_watch, for gpu_watch.py --format parquet output."""
+    try:
+        import pyarrow.parquet as pq
+    except Exception as e:
+        raise RuntimeError("reading Parquet requires pandas and pyarrow: {}".format(e))
+    if pd is None:
+        raise RuntimeError("reading Parquet requires pandas and pyarrow")
+    df = pq.read_table(path, columns=["timestamp", "gpu_index", "gpu_mem_mib"]).to_pandas()
+    # Typed columns, no parsing; gpu_index as strings to match the CSV labels
+    df["gpu_index"] = df["gpu_index"].astype("Int64").astype("string")
+    df["timestamp"] = _utc_to_local(df["timestamp"])
+    return _gpu_watch_frame_to_series(df, per_gpu)
+
+
+def read_bin_records(path: str, start: int = 0) -> np.ndarray:
+    """
+    Zero-copy structured view of records [start:] of a gpu_watch.py --format bin log.
+    A partially written trailing record is ignored, so a live log can be tailed by
+    passing the number of records already read as `start`.
+    """
+    with open(path, "rb") as f:
+        count = os.fstat(f.fileno()).st_size // BIN_RECORD.itemsize - start
+        if count <= 0:
+            return np.empty(0, dtype=BIN_RECORD)
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # The mapping stays alive as long as the returned array references it
+    return np.frombuffer(mm, dtype=BIN_RECORD, count=count, offset=start * BIN_RECORD.itemsize)
+
+
+def load_series_from_bin(path: str, per_gpu: bool) -> Tuple[
+    Dict[str, Series],  # gpu
+    Dict[str, Series],  # ram (none here)
+    Dict[str, Series],  # cpu (none here)
+]:
+    """Same as load_series_from_gpu_watch, for gpu_watch.py --format bin output."""
+    recs = read_bin_records(path)
+    # Group by timestamp: sorted unique epochs plus each record's slot
+    epochs, slot = np.unique(recs["timestamp"], return_inverse=True)
+    # Local naive time like the other loaders; one conversion per distinct timestamp
+    times = np.array([datetime.fromtimestamp(int(e)) for e in epochs], dtype="datetime64[ns]")
+    mem = recs["gpu_mem_mib"]
+    if not per_gpu:
+        total = np.bincount(slot, weights=mem, minlength=len(epochs))
+        return {"Total": (times, total.astype(np.float32))}, {}, {}
+    gpu = recs["gpu_index"]
+    series: Dict[str, Series] = {}
+    for g in np.unique(gpu):
+        if g == BIN_NO_GPU:
+            continue
+        sel = gpu == g
+        per = np.bincount(slot[sel], weights=mem[sel], minlength=len(epochs))
+        series[f"GPU {g}"] = (times, per.astype(np.float32))
+    return series, {}, {}
+
+
+def _gpu_watch_frame_to_series(df: "pd.DataFrame", per_gpu: bool):
+    # df columns: timestamp (datetime64), gpu_index (string), gpu_mem_mib
+    df["gpu_mem_mib"] = pd.to_numeric(df["gpu_mem_mib"], errors="coerce")
+    df = df.dropna(subset=["timestamp", "gpu_mem_mib"])
+    total = df.groupby("timestamp", sort=True)["gpu_mem_mib"].sum()
+    if not per_gpu:
+        return {"Total": _from_pandas(total)}, {}, {}
+    df["gpu_index"] = df["gpu_index"].str.strip()
+    df = df[df["gpu_index"].fillna("") != ""]
+    # Every timestamp appears on every GPU line (0 where the GPU had no rows)
+    table = df.pivot_table(index="timestamp", columns="gpu_index", values="gpu_mem_mib",
+                           aggfunc="sum", fill_value=0).reindex(total.index, fill_value=0)
+    return {f"GPU {gpu}": _from_pandas(table[gpu]) for gpu in table.columns}, {}, {}
+
+
+def _load_mem_only_pandas(source: Union[str, TextIO]):
+    df = pd.read_csv(source, usecols=lambda c: c in ("timestamp", "used_mib", "sys_used_mib", "cpu_pct"),
+                     dtype={"timestamp": "string"})
+    # `date -Is` carries a UTC offset that can change across DST; normalized to UTC
+    df["timestamp"] = _parse_times_pandas(df["timestamp"])
+    df = df.dropna(subset=["timestamp"]).sort_values("timestamp", kind="stable").set_index("timestamp")
+
+    def column(name: str) -> Series:
+        if name not in df.columns:
+            return _from_pairs([])
+        return _from_pandas(pd.to_numeric(df[name], errors="coerce").dropna())
+
+    ram_series = column("sys_used_mib")
+    cpu_series = column("cpu_pct")
+    return {"Total": column("used_mib")}, ({"System": ram_series} if len(ram_series[0]) else {}), ({"CPU %": cpu_series} if len(cpu_series[0]) else {})
+
+
+def load_series_from_gpu_watch(source: Union[str, TextIO], per_gpu: bool) -> Tuple[
+    Dict[str, Series],  # gpu
+    Dict[str, Series],  # ram (none here)
+    Dict[str, Series],  # cpu (none here)
 ]:
     """Return (gpu_series_map, ram_series_map, cpu_series_map). Only GPU is populated for this format."""
-    by_ts_total: Dict[str, float] = defaultdict(float)  # ts -> total MiB
-    by_ts_gpu: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))  # ts -> gpu -> MiB
+    if pd is not None:
+        return _load_gpu_watch_pandas(source, per_gpu)
+    # ts -> gpu -> MiB; gpu "" (unresolved index) only counts toward the total
+    by_ts_gpu: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    seen_gpus = set()  # all GPU indices, collected while reading
 
-    with open(path, newline="") as f:
+    with _opened(source) as f:
         r = csv.DictReader(f)
         for row in r:
             ts = row.get("timestamp")
@@ -63,39 +262,39 @@ def load_series_from_gpu_watch(path: str, per_gpu: bool) -> Tuple[
                 mem_val = float(mem)
             except ValueError:
                 continue
-            by_ts_total[ts] += mem_val
             gpu = (row.get("gpu_index") or "").strip()
-            if gpu:
-                by_ts_gpu[ts][gpu] += mem_val
+            by_ts_gpu[ts][gpu] += mem_val
+            seen_gpus.add(gpu)
+
+    # Parse each timestamp once, then sort on the parsed (naive) datetimes
+    ts_parsed = [(_naive(parse_time(ts)), ts) for ts in by_ts_gpu]
+    ts_parsed.sort()
 
     if per_gpu:
         # Build series per GPU index
         series: Dict[str, List[Tuple[datetime, float]]] = defaultdict(list)
-        # Collect all unique GPUs seen
-        all_gpus = set()
-        for ts, gpu_map in by_ts_gpu.items():
-            all_gpus.update(gpu_map.keys())
-        # Sorted timestamps
-        times_sorted = sorted(by_ts_total.keys(), key=parse_time)
-        for gpu in sorted(all_gpus, key=lambda x: (x == "", x)):
-            for ts in times_sorted:
+        seen_gpus.discard("")
+        for gpu in sorted(seen_gpus):
+            for t, ts in ts_parsed:
                 val = by_ts_gpu.get(ts, {}).get(gpu, 0.0)
-                series[f"GPU {gpu}"] .append((parse_time(ts), val))
-        return series, {}, {}
+                series[f"GPU {gpu}"] .append((t, val))
+        return {name: _from_pairs(pairs) for name, pairs in series.items()}, {}, {}
     else:
-        times_sorted = sorted(by_ts_total.keys(), key=parse_time)
-        return {"Total": [(parse_time(ts), by_ts_total[ts]) for ts in times_sorted]}, {}, {}
+        # Totals derived once per timestamp instead of a second dict update per row
+        return {"Total": _from_pairs([(t, sum(by_ts_gpu[ts].values())) for t, ts in ts_parsed])}, {}, {}
 
 
-def load_series_from_mem_only(path: str) -> Tuple[
-    Dict[str, List[Tuple[datetime, float]]],  # gpu
-    Dict[str, List[Tuple[datetime, float]]],  # ram
-    Dict[str, List[Tuple[datetime, float]]],  # cpu
+def load_series_from_mem_only(source: Union[str, TextIO]) -> Tuple[
+    Dict[str, Series],  # gpu
+    Dict[str, Series],  # ram
+    Dict[str, Series],  # cpu
 ]:
+    if pd is not None:
+        return _load_mem_only_pandas(source)
     gpu_series: List[Tuple[datetime, float]] = []
     ram_series: List[Tuple[datetime, float]] = []
     cpu_series: List[Tuple[datetime, float]] = []
-    with open(path, newline="") as f:
+    with _opened(source) as f:
         r = csv.DictReader(f)
         for row in r:
             ts = row.get("timestamp")
@@ -103,50 +302,55 @@ def load_series_from_mem_only(path: str) -> Tuple[
             sys_used = row.get("sys_used_mib")
             if ts and used not in (None, ""):
                 try:
-                    gpu_series.append((parse_time(ts), float(used)))
+                    gpu_series.append((_naive(parse_time(ts)), float(used)))
                 except Exception:
                     pass
             if ts and sys_used not in (None, ""):
                 try:
-                    ram_series.append((parse_time(ts), float(sys_used)))
+                    ram_series.append((_naive(parse_time(ts)), float(sys_used)))
                 except Exception:
                     pass
             cpu_pct = row.get("cpu_pct")
             if ts and cpu_pct not in (None, ""):
                 try:
-                    cpu_series.append((parse_time(ts), float(cpu_pct)))
+                    cpu_series.append((_naive(parse_time(ts)), float(cpu_pct)))
                 except Exception:
                     pass
     gpu_series.sort(key=lambda x: x[0])
     ram_series.sort(key=lambda x: x[0])
     cpu_series.sort(key=lambda x: x[0])
-    return {"Total": gpu_series}, ({"System": ram_series} if ram_series else {}), ({"CPU %": cpu_series} if cpu_series else {})
+    return ({"Total": _from_pairs(gpu_series)}, ({"System": _from_pairs(ram_series)} if ram_series else {}),
+            ({"CPU %": _from_pairs(cpu_series)} if cpu_series else {}))
 
 
 def auto_loader(path: str, per_gpu: bool) -> Tuple[
-    Dict[str, List[Tuple[datetime, float]]],
-    Dict[str, List[Tuple[datetime, float]]],
-    Dict[str, List[Tuple[datetime, float]]],
+    Dict[str, Series],
+    Dict[str, Series],
+    Dict[str, Series],
 ]:
-    # Peek header to decide
+    if path.lower().endswith(".parquet"):
+        return load_series_from_parquet(path, per_gpu)
+    if path.lower().endswith(".bin"):
+        return load_series_from_bin(path, per_gpu)
+    # Peek header to decide, then rewind and hand the same handle to the loader
     with open(path, newline="") as f:
-        reader = csv.reader(f)
-        try:
-            header = next(reader)
-        except StopIteration:
-            return {"Total": []}, {}, {}
-    header_lc = [h.strip().lower() for h in header]
-    if "gpu_mem_mib" in header_lc:
-        return load_series_from_gpu_watch(path, per_gpu)
-    if "used_mib" in header_lc:
-        return load_series_from_mem_only(path)
+        first = f.readline()
+        if not first:
+            return {"Total": _from_pairs([])}, {}, {}
+        header = next(csv.reader([first]))
+        f.seek(0)
+        header_lc = [h.strip().lower() for h in header]
+        if "gpu_mem_mib" in header_lc:
+            return load_series_from_gpu_watch(f, per_gpu)
+        if "used_mib" in header_lc:
+            return load_series_from_mem_only(f)
     raise ValueError("Unrecognized CSV header. Expected gpu_mem_mib or used_mib column.")
 
 
 def do_plot(
-    gpu_series_map: Dict[str, List[Tuple[datetime, float]]],
-    ram_series_map: Optional[Dict[str, List[Tuple[datetime, float]]]] = None,
-    cpu_series_map: Optional[Dict[str, List[Tuple[datetime, float]]]] = None,
+    gpu_series_map: Dict[str, Series],
+    ram_series_map: Optional[Dict[str, Series]] = None,
+    cpu_series_map: Optional[Dict[str, Series]] = None,
     title_gpu: str = "GPU Memory Usage",
     title_ram: str = "System Memory Usage",
     title_cpu: str = "CPU Usage (%)",
@@ -157,6 +361,8 @@ def do_plot(
     try:
         import matplotlib.pyplot as plt
         import matplotlib.dates as mdates
+        from matplotlib.collections import LineCollection
+        from matplotlib.lines import Line2D
     except Exception as e:
         print("matplotlib not available: {}".format(e), file=sys.stderr)
         sys.exit(2)
@@ -168,19 +374,25 @@ def do_plot(
         fig, (ax1, ax2, ax3) = fig_axes
     else:
         fig, (ax1, ax2) = fig_axes
-    any_points = False
     # Top subplot: GPU memory
-    for name, series in gpu_series_map.items():
-        if not series:
-            continue
-        any_points = True
-        xs = [t for t, _ in series]
-        ys = [v for _, v in series]
-        ax1.plot(xs, ys, label=name, linewidth=1.8)
-
-    if not any_points:
+    gpu_lines = [(name, xs, ys) for name, (xs, ys) in gpu_series_map.items() if len(xs)]
+    if not gpu_lines:
         print("No data points to plot.", file=sys.stderr)
         sys.exit(1)
+    legend_handles = None
+    if len(gpu_lines) == 1:
+        name, xs, ys = gpu_lines[0]
+        ax1.plot(xs, ys, label=name, linewidth=1.8)
+    else:
+        # Per-GPU lines: draw all of them as one LineCollection instead of N ax.plot calls
+        colors = [plt.cm.tab10(i % 10) for i in range(len(gpu_lines))]
+        segs = [np.column_stack([mdates.date2num(xs), ys]) for _, xs, ys in gpu_lines]
+        ax1.add_collection(LineCollection(segs, linewidths=1.8, colors=colors))
+        ax1.xaxis_date()
+        ax1.autoscale_view()
+        # A collection has one legend entry; use proxies for one entry per GPU
+        legend_handles = [Line2D([], [], color=c, linewidth=1.8, label=name)
+                          for c, (name, _, _) in zip(colors, gpu_lines)]
 
     ax1.set_title(title_gpu)
     ax1.set_ylabel("GPU Memory (MiB)")
@@ -193,19 +405,17 @@ def do_plot(
     fig.autofmt_xdate()  # rotates tick labels
 
     if len(gpu_series_map) > 1:
-        ax1.legend(loc="best")
+        ax1.legend(handles=legend_handles, loc="best")
 
     ax1.grid(True, linestyle=":", alpha=0.4)
 
     # Bottom subplot: System RAM usage (if available)
     has_ram = False
     if ram_series_map:
-        for name, series in ram_series_map.items():
-            if not series:
+        for name, (xs, ys) in ram_series_map.items():
+            if not len(xs):
                 continue
             has_ram = True
-            xs = [t for t, _ in series]
-            ys = [v for _, v in series]
             ax2.plot(xs, ys, label=name, color="#cc5500", linewidth=1.8)
     if has_ram:
         ax2.set_title(title_ram)
@@ -223,12 +433,10 @@ def do_plot(
     if plot_cpu:
         has_cpu = False
         if cpu_series_map:
-            for name, series in cpu_series_map.items():
-                if not series:
+            for name, (xs, ys) in cpu_series_map.items():
+                if not len(xs):
                     continue
                 has_cpu = True
-                xs = [t for t, _ in series]
-                ys = [v for _, v in series]
                 ax3.plot(xs, ys, label=name, color="#2a9d8f", linewidth=1.8)
         if has_cpu:
             ax3.set_title(title_cpu)
@@ -252,9 +460,9 @@ def do_plot(
 
 
 def main():
-    ap = argparse.ArgumentParser(description="Plot GPU memory usage over time from CSV.")
-    ap.add_argument("csv", help="Path to CSV file from gpu_watch.py or mem_only.csv")
-    ap.add_argument("--per-gpu", action="store_true", help="Plot separate lines for each GPU index (gpu_watch.csv only)")
+    ap = argparse.ArgumentParser(description="Plot GPU memory usage over time from CSV, Parquet or bin logs.")
+    ap.add_argument("csv", help="Path to CSV file from gpu_watch.py or mem_only.csv, or a gpu_watch.py .parquet/.bin file")
+    ap.add_argument("--per-gpu", action="store_true", help="Plot separate lines for each GPU index (gpu_watch.py logs: csv, parquet or bin)")
     ap.add_argument("--output", "-o", help="Output image path (e.g., plot.png). If omitted, shows interactively.")
     ap.add_argument("--cpu", action="store_true", help="Add third subplot with CPU usage percent (if column cpu_pct exists)")
     ap.add_argument("--show", action="store_true", help="Force showing the plot window")
@@ -262,13 +470,13 @@ def main():
 
     path = os.path.expanduser(args.csv)
     if not os.path.exists(path):
-        print(f"CSV not found: {path}", file=sys.stderr)
+        print(f"Log not found: {path}", file=sys.stderr)
         sys.exit(1)
 
     try:
         gpu_map, ram_map, cpu_map = auto_loader(path, args.per_gpu)
     except Exception as e:
-        print(f"Failed to read CSV: {e}", file=sys.stderr)
+        print(f"Failed to read log: {e}", file=sys.stderr)
         sys.exit(1)
 
     title_gpu = "GPU Memory Usage" + (" (per GPU)" if args.per_gpu else "")
@@ -0,0 +1,433 @@
+import csv
+import io
+import os
+import re
+import signal
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import gpu_watch
+from gpu_watch import CsvLog, ProcSample, csv_quote
+
+
+@pytest.mark.parametrize("value", [
+    "python train.py",
+    "python train.py --tags a,b",
+    'python -c "print(1)"',
+    "line\nbreak",
+    "cr\rreturn",
+    "",
+])
+def test_csv_quote_matches_csv_module(value):
+    buf = io.StringIO()
+    csv.writer(buf).writerow(["x", value])
+    assert "x," + csv_quote(value) + "\r\n" == buf.getvalue()
+
+
+def read_rows(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_csv_log_writes_header_and_rows(tmp_path):
+    path = tmp_path / "log.csv"
+    log = CsvLog(str(path), True, 1, False)
+    log.begin(1736518950.7)
+    log.write(ProcSample(1234, 0, 8234, 72, 58, "pmon"), 'python "a,b".py')
+    log.write(ProcSample(99, None, 5, None, None, ""), "x")
+    log.end()
+    log.close()
+    rows = read_rows(path)
+    assert rows[0] == gpu_watch.CSV_HEADER.strip().split(",")
+    assert rows[1] == ["1736518950", "0", "1234", 'python "a,b".py', "8234", "72", "58"]
+    assert rows[2] == ["1736518950", "", "99", "x", "5", "", ""]
+
+
+def test_csv_log_no_header_when_appending(tmp_path):
+    path = tmp_path / "log.csv"
+    log = CsvLog(str(path), False, 1, False)
+    log.begin(0)
+    log.write(ProcSample(1, 0, 1, 1, 1, ""), "a")
+    log.close()
+    assert read_rows(path) == [["0", "0", "1", "a", "1", "1", "1"]]
+
+
+def test_csv_log_iso_timestamps(tmp_path):
+    path = tmp_path / "log.csv"
+    log = CsvLog(str(path), False, 1, True)
+    now = 1736518950.0
+    log.begin(now)
+    log.write(ProcSample(1, 0, 1, None, None, ""), "a")
+    log.close()
+    assert read_rows(path)[0][0] == datetime.fromtimestamp(now).isoformat(timespec="seconds")
+
+
+def test_csv_log_flushes_every_n_rows(tmp_path):
+    path = tmp_path / "log.csv"
+    log = CsvLog(str(path), False, 3, False)
+    log.begin(0)
+    for pid in (1, 2):
+        log.write(ProcSample(pid, 0, 1, None, None, ""), "a")
+    log.end()
+    assert path.read_bytes() == b""
+    log.write(ProcSample(3, 0, 1, None, None, ""), "a")
+    log.end()
+    assert len(read_rows(path)) == 3
+    log.close()
+
+
+@pytest.fixture
+def pid_caches():
+    # Module-level caches persist across tests; start and end each test empty
+    gpu_watch._cmd_cache.clear()
+    gpu_watch._match_cache.clear()
+    yield
+    gpu_watch._cmd_cache.clear()
+    gpu_watch._match_cache.clear()
+
+
+@pytest.fixture
+def ps_calls(monkeypatch, pid_caches):
+    calls = []
+
+    def fake_run_cmd(cmd, timeout=5.0):
+        calls.append(cmd)
+        return "python train.py\n"
+    monkeypatch.setattr(gpu_watch, "run_cmd", fake_run_cmd)
+    # No /proc/<pid> for these PIDs: _match_string() finds nothing
+    monkeypatch.setattr(gpu_watch, "_match_string", lambda pid: gpu_watch._cmd_cache.get(pid, ""))
+    return calls
+
+
+def test_get_cmd_for_pid_skips_ps_with_procfs(monkeypatch, ps_calls):
+    monkeypatch.setattr(gpu_watch, "_have_procfs", True)
+    for _ in range(3):
+        assert gpu_watch.get_cmd_for_pid(4242) == ""
+    assert ps_calls == []
+
+
+def test_get_cmd_for_pid_caches_ps_without_procfs(monkeypatch, ps_calls):
+    monkeypatch.setattr(gpu_watch, "_have_procfs", False)
+    for _ in range(3):
+        assert gpu_watch.get_cmd_for_pid(4242) == "python train.py"
+    assert ps_calls == [["ps", "-o", "args=", "-p", "4242"]]
+
+
+def make_pynvml(procs, util=None, names=None, v3=None):
+    """
+    Just enough of pynvml for gpu_watch; device handles are GPU indices.
+    procs: per GPU, a list of (pid, used bytes) or the name of an NVMLError to raise.
+    util: gpu -> [(pid, timeStamp, sm, mem)]. v3: None (not exposed), "ok", or an error name.
+    """
+    class NVMLError(Exception):
+        pass
+    nv = SimpleNamespace(NVMLError=NVMLError, name_calls=[])
+    for err in ("Unknown", "FunctionNotFound", "GpuIsLost", "NotFound"):
+        setattr(nv, "NVMLError_" + err, type("NVMLError_" + err, (NVMLError,), {}))
+
+    def compute_procs(h):
+        if isinstance(procs[h], str):
+            raise getattr(nv, procs[h])()
+        return [SimpleNamespace(pid=pid, usedGpuMemory=used) for pid, used in procs[h]]
+
+    def compute_procs_v3(h):
+        if v3 != "ok":
+            raise getattr(nv, v3)()
+        return compute_procs(h)
+
+    def process_utilization(h, last_seen):
+        # Like NVML: only samples newer than last_seen, NOT_FOUND if there are none
+        samples = [SimpleNamespace(pid=pid, timeStamp=ts, smUtil=sm, memUtil=mem)
+                   for pid, ts, sm, mem in (util or {}).get(h, []) if ts > last_seen]
+        if not samples:
+            raise nv.NVMLError_NotFound()
+        return samples
+
+    def process_name(pid):
+        nv.name_calls.append(pid)
+        try:
+            return (names or {})[pid]
+        except KeyError:
+            raise nv.NVMLError_NotFound()
+
+    nv.nvmlInit = nv.nvmlShutdown = lambda: None
+    nv.nvmlDeviceGetCount = lambda: len(procs)
+    nv.nvmlDeviceGetHandleByIndex = lambda i: i
+    nv.nvmlDeviceGetComputeRunningProcesses = compute_procs
+    if v3 is not None:
+        nv.nvmlDeviceGetComputeRunningProcesses_v3 = compute_procs_v3
+    nv.nvmlDeviceGetProcessUtilization = process_utilization
+    nv.nvmlSystemGetProcessName = process_name
+    return nv
+
+
+@pytest.fixture
+def use_pynvml(monkeypatch, pid_caches):
+    def install(nv):
+        monkeypatch.setattr(gpu_watch, "pynvml", nv)
+        monkeypatch.setattr(gpu_watch, "_NVML_REFRESH_ERRORS", (nv.NVMLError_Unknown,))
+        monkeypatch.setattr(gpu_watch, "_nvml_ok", False)
+        monkeypatch.setattr(gpu_watch, "_nvml_handles", [])
+        monkeypatch.setattr(gpu_watch, "_nvml_compute_procs", None)
+        monkeypatch.setattr(gpu_watch, "_nvml_warned", set())
+        assert gpu_watch.init_nvml()
+        return nv
+    yield install
+    gpu_watch._last_seen_ts.clear()
+
+
+def test_nvml_skips_failing_device(use_pynvml, capsys):
+    use_pynvml(make_pynvml([[(10, 3 << 20)], "NVMLError_GpuIsLost", [(11, 1 << 20)]]))
+    for _ in range(2):
+        assert [(s.pid, s.gpu_index) for s in gpu_watch.sample_all()] == [(10, 0), (11, 2)]
+    # Reported once, not every sample
+    assert capsys.readouterr().err.count("GPU 1: cannot query compute processes") == 1
+
+
+def test_nvml_refresh_error_propagates(use_pynvml):
+    nv = use_pynvml(make_pynvml([[(10, 0)], "NVMLError_Unknown"]))
+    with pytest.raises(nv.NVMLError_Unknown):
+        gpu_watch.sample_all()
+
+
+def test_nvml_v3_used_when_resolvable(use_pynvml):
+    nv = use_pynvml(make_pynvml([[(10, 1 << 20)]], v3="ok"))
+    assert gpu_watch._nvml_compute_procs is nv.nvmlDeviceGetComputeRunningProcesses_v3
+
+
+def test_nvml_v3_falls_back_when_driver_lacks_it(use_pynvml):
+    nv = use_pynvml(make_pynvml([[(10, 1 << 20)]], v3="NVMLError_FunctionNotFound"))
+    assert gpu_watch._nvml_compute_procs is nv.nvmlDeviceGetComputeRunningProcesses
+    assert [s.pid for s in gpu_watch.sample_all()] == [10]
+
+
+def test_nvml_process_name_only_for_rows_that_need_it(monkeypatch, use_pynvml):
+    nv = use_pynvml(make_pynvml([[(10, 0), (11, 0), (12, 0)]], names={10: b"python", 11: "bash"}))
+    monkeypatch.setattr(gpu_watch, "_match_string", lambda pid: "")
+    samples = gpu_watch.sample_all()
+    assert [s.cmd for s in samples] == ["", "", ""]
+    assert nv.name_calls == []
+
+    # --pid: the filter never asks for a name
+    match_pid = gpu_watch.make_match_fn(None, 11)
+    assert [s.pid for s in samples if match_pid(s)] == [11]
+    assert nv.name_calls == []
+
+    # --match without /proc: the NVML name is the fallback (bytes from older pynvml)
+    match_re = gpu_watch.make_match_fn(re.compile("python"), None)
+    assert [s.pid for s in samples if match_re(s)] == [10]
+    assert nv.name_calls == [10, 11, 12]
+    assert gpu_watch._nvml_process_name(12) == ""
+
+
+
+@pytest.fixture
+def restore_signals():
+    saved = {sig: signal.getsignal(sig) for sig in (signal.SIGTERM, signal.SIGHUP)}
+    yield
+    for sig, handler in saved.items():
+        signal.signal(sig, handler)
+
+
+def test_parquet_log_readable_after_sigterm(tmp_path, monkeypatch, restore_signals):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "log.parquet"
+    sleeps = []
+
+    def fake_sleep(delay):
+        # Stopped between samples, the way `kill` or systemd would
+        sleeps.append(delay)
+        if len(sleeps) == 2:
+            os.kill(os.getpid(), signal.SIGTERM)
+    monkeypatch.setattr(sys, "argv", ["gpu_watch.py", "--format", "parquet", "--output", str(path)])
+    monkeypatch.setattr(gpu_watch, "init_nvml", lambda: True)
+    monkeypatch.setattr(gpu_watch, "refresh_devices", lambda: None)
+    monkeypatch.setattr(gpu_watch, "sample_all", lambda: [ProcSample(1234, 0, 8234, 72, None, "")])
+    monkeypatch.setattr(gpu_watch, "get_cmd_for_pid", lambda pid: "python train.py")
+    monkeypatch.setattr(gpu_watch.time, "sleep", fake_sleep)
+    gpu_watch.main()
+    table = pq.read_table(str(path))
+    assert table.column("pid").to_pylist() == [1234, 1234]
+    assert table.column("cmd").to_pylist() == ["python train.py"] * 2
+
+
+def test_bin_log_drops_partial_trailing_record(tmp_path, capsys):
+    path = tmp_path / "log.bin"
+    path.write_bytes(gpu_watch.BIN_RECORD.pack(0, 1, 100, 0, 5, 6) + b"\x01" * 5)
+    log = gpu_watch.BinLog(str(path), 1)
+    log.begin(30)
+    log.write(ProcSample(2, None, 50, None, None, ""), "b")
+    log.close()
+    data = path.read_bytes()
+    assert list(gpu_watch.BIN_RECORD.iter_unpack(data)) == [(0, 1, 100, 0, 5, 6), (30, 2, 50, 0xFFFF, 0xFF, 0xFF)]
+    assert "dropping 5 bytes" in capsys.readouterr().err
+
+
+def test_nvml_walks_every_device(use_pynvml):
+    use_pynvml(make_pynvml([[(10, 3 << 20), (11, None)], [], [(10, (1 << 20) + 5)]]))
+    assert gpu_watch.sample_all() == [
+        ProcSample(10, 0, 3, None, None, ""),
+        ProcSample(11, 0, 0, None, None, ""),  # usedGpuMemory unavailable
+        ProcSample(10, 2, 1, None, None, ""),
+    ]
+
+
+def test_nvml_no_devices_or_processes(use_pynvml):
+    use_pynvml(make_pynvml([]))
+    assert gpu_watch.sample_all() == []
+    use_pynvml(make_pynvml([[], []]))
+    assert gpu_watch.sample_all() == []
+
+
+def test_nvml_utilization_keeps_newest_sample(use_pynvml):
+    util = {0: [(10, 100, 20, 5), (10, 300, 70, 50), (10, 200, 40, 9), (11, 150, 1, 2)]}
+    use_pynvml(make_pynvml([[(10, 0), (11, 0)]], util=util))
+    assert [(s.pid, s.sm, s.mem) for s in gpu_watch.sample_all()] == [(10, 70, 50), (11, 1, 2)]
+    assert gpu_watch._last_seen_ts == {0: 300}
+    # Nothing newer than the last sample consumed: utilization is unknown, not repeated
+    assert [(s.pid, s.sm, s.mem) for s in gpu_watch.sample_all()] == [(10, None, None), (11, None, None)]
+    util[0].append((11, 400, 9, 8))
+    assert [(s.pid, s.sm) for s in gpu_watch.sample_all()] == [(10, None), (11, 9)]
+
+
+NVIDIA_SMI = {
+    "--query-gpu=index,uuid": "0, GPU-aaa\n1, GPU-bbb\n",
+    "--query-compute-apps=pid,gpu_uuid,used_memory": (
+        "1234, GPU-aaa, 8234\n5678, GPU-new, 100\n999, GPU-bbb, 5\nNo running processes found\n"),
+    "pmon": (
+        "# gpu        pid  type    sm   mem   enc   dec   command\n"
+        "# Idx          #   C/G     %     %     %     %   name\n"
+        "    0       1234     C    72    58     -     -   python\n"
+        "    1       5678     C     -     3     -     -   train worker\n"
+        "    1          -     -     -     -     -     -   -\n"),
+}
+
+
+@pytest.fixture
+def fake_nvidia_smi(monkeypatch):
+    # nvidia-smi fallback: no pynvml, run_cmd() answers from canned outputs
+    calls = []
+
+    def fake_run_cmd(cmd, timeout=5.0):
+        calls.append(cmd)
+        if cmd[0] == "nvidia-smi":
+            return NVIDIA_SMI.get(cmd[1], "")
+        if cmd[0] == "which":
+            return "/usr/bin/nvidia-smi\n"
+        return ""
+    monkeypatch.setattr(gpu_watch, "pynvml", None)
+    monkeypatch.setattr(gpu_watch, "_nvml_ok", False)
+    monkeypatch.setattr(gpu_watch, "_uuid_to_index", {})
+    monkeypatch.setattr(gpu_watch, "run_cmd", fake_run_cmd)
+    return calls
+
+
+def test_nvidia_smi_fallback_joins_memory_and_pmon(fake_nvidia_smi):
+    assert not gpu_watch.init_nvml()
+    gpu_watch.refresh_devices()
+    assert gpu_watch._uuid_to_index == {"GPU-aaa": 0, "GPU-bbb": 1}
+    assert gpu_watch.sample_all() == [
+        ProcSample(1234, 0, 8234, 72, 58, "python"),
+        # Unknown UUID (e.g. hot-plugged GPU): index taken from the pmon row
+        ProcSample(5678, 1, 100, None, 3, "train worker"),
+        # No pmon row: memory only
+        ProcSample(999, 1, 5, None, None, ""),
+    ]
+
+
+def test_nvidia_smi_fallback_no_running_processes(fake_nvidia_smi, monkeypatch):
+    monkeypatch.setitem(NVIDIA_SMI, "--query-compute-apps=pid,gpu_uuid,used_memory", "No running processes found\n")
+    monkeypatch.setitem(NVIDIA_SMI, "pmon", "# gpu pid type sm mem enc dec command\n    0 - - - - - - -\n")
+    gpu_watch.refresh_devices()
+    assert gpu_watch.sample_all() == []
+
+
+def test_main_exits_without_nvml_or_nvidia_smi(fake_nvidia_smi, monkeypatch, capsys):
+    monkeypatch.setattr(gpu_watch, "run_cmd", lambda cmd, timeout=5.0: "")
+    monkeypatch.setattr(sys, "argv", ["gpu_watch.py", "--output", "unused.csv"])
+    with pytest.raises(SystemExit) as exc:
+        gpu_watch.main()
+    assert exc.value.code == 1
+    assert "pynvml unavailable and nvidia-smi not found" in capsys.readouterr().err
+
+
+def test_compile_matcher_regex_and_literal_fallback():
+    assert gpu_watch.compile_matcher(r"train\.py$").search("python train.py")
+    # Invalid regex: matched as a literal substring
+    literal = gpu_watch.compile_matcher("train[0")
+    assert literal.search("python train[0].py")
+    assert not literal.search("python train0.py")
+
+
+@pytest.fixture
+def cmdlines(monkeypatch, pid_caches):
+    # Fake /proc: pid -> command line; absent pids have no readable cmdline
+    procs = {1: "python train.py", 2: "bash", 3: "python eval.py"}
+    reads = []
+
+    def fake_match_string(pid):
+        reads.append(pid)
+        return procs.get(pid, "")
+    monkeypatch.setattr(gpu_watch, "_match_string", fake_match_string)
+    return reads
+
+
+def samples(*pids, cmd=""):
+    return [ProcSample(pid, 0, 1, None, None, cmd) for pid in pids]
+
+
+def test_match_fn_pid_target(cmdlines):
+    match = gpu_watch.make_match_fn(gpu_watch.compile_matcher("python"), 2)
+    assert [s.pid for s in samples(1, 2, 3) if match(s)] == [2]
+    assert cmdlines == []  # --pid takes precedence and never reads /proc
+
+
+def test_match_fn_no_filter(cmdlines):
+    match = gpu_watch.make_match_fn(None, None)
+    assert [s.pid for s in samples(1, 2, 3) if match(s)] == [1, 2, 3]
+    assert cmdlines == []
+
+
+def test_match_fn_regex(cmdlines):
+    match = gpu_watch.make_match_fn(gpu_watch.compile_matcher(r"python \w+\.py"), None)
+    assert [s.pid for s in samples(1, 2, 3) if match(s)] == [1, 3]
+
+
+def test_match_verdict_cached_per_pid(cmdlines):
+    match = gpu_watch.make_match_fn(gpu_watch.compile_matcher("python"), None)
+    for _ in range(3):
+        assert [s.pid for s in samples(1, 2) if match(s)] == [1]
+    assert cmdlines == [1, 2]
+    assert gpu_watch._match_cache == {1: True, 2: False}
+
+
+def test_match_verdict_not_cached_without_proc(cmdlines):
+    # pid 7 has no readable /proc entry: each sample falls back to its pmon name
+    match = gpu_watch.make_match_fn(gpu_watch.compile_matcher("python"), None)
+    assert match(samples(7, cmd="python")[0])
+    assert not match(samples(7, cmd="bash")[0])
+    assert 7 not in gpu_watch._match_cache
+    assert cmdlines == [7, 7]
+
+
+def test_prune_pid_caches_drops_exited_pids(monkeypatch, pid_caches):
+    gpu_watch._cmd_cache.update({1: "a", 2: "b", 3: "c"})
+    gpu_watch._match_cache.update({1: True, 3: False})
+    monkeypatch.setattr(os, "listdir", lambda path: ["1", "2", "self", "meminfo"])
+    gpu_watch.prune_pid_caches()
+    assert gpu_watch._cmd_cache == {1: "a", 2: "b"}
+    assert gpu_watch._match_cache == {1: True}
+
+
+def test_prune_pid_caches_clears_without_proc(monkeypatch, pid_caches):
+    gpu_watch._cmd_cache[1] = "a"
+    gpu_watch._match_cache[1] = True
+
+    def no_proc(path):
+        raise FileNotFoundError(path)
+    monkeypatch.setattr(os, "listdir", no_proc)
+    gpu_watch.prune_pid_caches()
+    assert gpu_watch._cmd_cache == {} and gpu_watch._match_cache == {}
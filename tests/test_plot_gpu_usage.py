@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import plot_gpu_usage
+from plot_gpu_usage import load_series_from_gpu_watch, parse_time
+
+HEADER = "timestamp,gpu_index,pid,cmd,gpu_mem_mib,sm_util_pct,mem_util_pct\r\n"
+EPOCH = 1736518950
+
+
+@pytest.mark.parametrize("ts, expected", [
+    ("2025-01-10T14:22:30", datetime(2025, 1, 10, 14, 22, 30)),
+    ("2025-01-10 14:22:30", datetime(2025, 1, 10, 14, 22, 30)),
+    ("2025-01-10T14:22:30+09:00", datetime(2025, 1, 10, 14, 22, 30, tzinfo=timezone(timedelta(hours=9)))),
+])
+def test_parse_time_iso(ts, expected):
+    assert parse_time(ts) == expected
+
+
+@pytest.mark.parametrize("ts, expected", [
+    ("2025/01/10 14:22:30", datetime(2025, 1, 10, 14, 22, 30)),
+    ("2025-1-5 14:22:30", datetime(2025, 1, 5, 14, 22, 30)),
+])
+def test_parse_time_slow_path(ts, expected):
+    assert parse_time(ts) == expected
+
+
+def test_parse_time_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_time("not a time")
+
+
+def test_parse_time_epoch_is_local_naive():
+    assert parse_time(str(EPOCH)) == datetime.fromtimestamp(EPOCH)
+
+
+@pytest.fixture(params=["pandas", "csv"])
+def loader_backend(request, monkeypatch):
+    if request.param == "pandas":
+        pytest.importorskip("pandas")
+    else:
+        monkeypatch.setattr(plot_gpu_usage, "pd", None)
+    return request.param
+
+
+def test_mixed_epoch_and_iso_log(tmp_path, loader_backend):
+    # An epoch log appended to after switching to --iso-timestamps, plus a
+    # repeated header row from a run without --append and hand-edited ISO variants
+    local = [datetime.fromtimestamp(EPOCH + d) for d in (5, 15, 20, 25)]
+    iso = [local[0].isoformat(timespec="seconds"), local[1].isoformat(" ", timespec="seconds"),
+           local[2].strftime("%Y/%m/%d %H:%M:%S"), local[3].isoformat(timespec="seconds") + ".5"]
+    path = tmp_path / "mixed.csv"
+    path.write_text(HEADER + f"{EPOCH},0,1,a,100,,\r\n{EPOCH},1,2,b,50,,\r\n"
+                    + HEADER + f"{iso[0]},0,1,a,200,,\r\n{EPOCH + 10},0,1,a,300,,\r\n"
+                    + "".join(f"{ts},0,1,a,{400 + i},,\r\n" for i, ts in enumerate(iso[1:])))
+    gpu, _, _ = load_series_from_gpu_watch(str(path), per_gpu=False)
+    times, values = gpu["Total"]
+    expected = [datetime.fromtimestamp(EPOCH + d) for d in (0, 5, 10, 15, 20)]
+    expected.append(local[3] + timedelta(milliseconds=500))
+    assert times.tolist() == np.array(expected, dtype="datetime64[ns]").tolist()
+    assert values.tolist() == [150, 200, 300, 400, 401, 402]
+
+
+def test_mem_only_iso_variants(tmp_path, loader_backend):
+    # gpu_watch.sh writes `date -Is` (with offset); older or edited logs may not
+    path = tmp_path / "mem.csv"
+    path.write_text("timestamp,used_mib\n2025-01-10T14:22:30+01:00,1\n"
+                    "2025-01-10 14:23:00,2\n2025/01/10 14:24:00,3\n")
+    gpu, _, _ = plot_gpu_usage.load_series_from_mem_only(str(path))
+    times, values = gpu["Total"]
+    expected = [datetime(2025, 1, 10, 13, 22, 30), datetime(2025, 1, 10, 14, 23), datetime(2025, 1, 10, 14, 24)]
+    assert times.tolist() == np.array(expected, dtype="datetime64[ns]").tolist()
+    assert values.tolist() == [1, 2, 3]
+
+
+def test_bin_log_round_trip(tmp_path):
+    from gpu_watch import BinLog, ProcSample
+    from plot_gpu_usage import read_bin_records
+
+    path = tmp_path / "log.bin"
+    log = BinLog(str(path), 1)
+    log.begin(EPOCH)
+    log.write(ProcSample(1234, 0, 8234, 72, 58, "pmon"), "python train.py")
+    log.write(ProcSample(99, None, 5, None, None, ""), "x")
+    log.end()
+    log.begin(EPOCH + 1)
+    log.write(ProcSample(1234, 1, 100, 3, None, ""), "python train.py")
+    log.end()
+    log.close()
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 7)  # a record still being written
+
+    recs = read_bin_records(str(path))
+    assert recs.tolist() == [
+        (EPOCH, 1234, 8234, 0, 72, 58),
+        (EPOCH, 99, 5, plot_gpu_usage.BIN_NO_GPU, 0xFF, 0xFF),
+        (EPOCH + 1, 1234, 100, 1, 3, 0xFF),
+    ]
+    assert read_bin_records(str(path), start=2).tolist() == recs[2:].tolist()
+    assert len(read_bin_records(str(path), start=3)) == 0
+
+
+def test_parquet_log_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    pytest.importorskip("pandas")
+    from gpu_watch import ParquetLog, ProcSample
+    from plot_gpu_usage import load_series_from_parquet
+
+    path = tmp_path / "log.parquet"
+    log = ParquetLog(str(path), batch_rows=2)
+    log.begin(EPOCH)
+    log.write(ProcSample(1, 0, 100, 10, None, ""), "a")
+    log.end()
+    assert len(log.columns[0]) == 1  # below the threshold: still buffered
+    log.write(ProcSample(2, 1, 50, None, None, ""), "b")
+    log.end()
+    assert len(log.columns[0]) == 0  # one row group written
+    log.begin(EPOCH + 30)
+    log.write(ProcSample(1, 0, 300, None, None, ""), "a")
+    log.end()
+    log.close()  # flushes the partial batch and writes the footer
+
+    import pyarrow.parquet as pq
+    assert pq.ParquetFile(str(path)).metadata.num_row_groups == 2
+    times = np.array([datetime.fromtimestamp(EPOCH), datetime.fromtimestamp(EPOCH + 30)], dtype="datetime64[ns]")
+    gpu, _, _ = load_series_from_parquet(str(path), per_gpu=False)
+    assert gpu["Total"][0].tolist() == times.tolist()
+    assert gpu["Total"][1].tolist() == [150, 300]
+    gpu, _, _ = load_series_from_parquet(str(path), per_gpu=True)
+    assert {name: values.tolist() for name, (_, values) in gpu.items()} == {"GPU 0": [100, 300], "GPU 1": [50, 0]}